@@ -5,19 +5,35 @@ Each session has its own slides directory, overlay, and converter.
 """
 
 import os
+import re
+import shutil
+import logging
+import asyncio
 import argparse
+import functools
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 from datetime import datetime, timedelta
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query, Request, Depends, status
-from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 import secrets
 from session_manager import SessionManager, ALLOWED_EXTENSIONS, is_gcs_path
+from ttl_cache import TTLCache
 
 
+# Prefer orjson for response serialization when available (2-10x faster
+# than stdlib json on the listing endpoints); fall back silently otherwise.
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+    _json_response_class = ORJSONResponse
+except ImportError:
+    _json_response_class = JSONResponse
+
 # Google Cloud Storage imports
 try:
     from google.cloud import storage
@@ -27,11 +43,14 @@ except ImportError:
     GCS_AVAILABLE = False
     print("Warning: google-cloud-storage not installed. GCS features disabled.")
 
+logger = logging.getLogger(__name__)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="WSI Viewer",
     description="Session-based whole slide imaging viewer",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=_json_response_class,
 )
 
 app.add_middleware(
@@ -73,6 +92,7 @@ overlay_paths = args.overlay if args.overlay else []
 # ========================================
 # Authentication Setup
 # ========================================
+import hmac
 import hashlib
 
 # Use bcrypt library directly to avoid passlib's 72-byte internal test.
@@ -125,18 +145,40 @@ if AUTH_PASSWORD_HASH is None:
         raise
     print(f"⚠️  Using development password. Set AUTH_PASSWORD_HASH for production!")
 
+# Successful verifications are remembered briefly so every authenticated
+# request doesn't re-run bcrypt (hundreds of ms by design). The cache key
+# is an HMAC of the presented credentials under a per-process random
+# secret — no password material is stored or recoverable from it, and
+# only an exact replay of already-valid credentials can hit the cache.
+_auth_cache = TTLCache(ttl_seconds=300.0, max_entries=128)
+_auth_cache_secret = secrets.token_bytes(32)
+
+
+def _auth_cache_key(username: str, password: str) -> str:
+    mac = hmac.new(_auth_cache_secret, digestmod=hashlib.sha256)
+    mac.update(username.encode("utf-8"))
+    mac.update(b"\x00")
+    mac.update(password.encode("utf-8"))
+    return mac.hexdigest()
+
+
 # Authentication dependency
 def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
     """Verify username and password."""
+    cache_key = _auth_cache_key(credentials.username, credentials.password)
+    if _auth_cache.get(cache_key):
+        return credentials.username
+
     username_correct = secrets.compare_digest(credentials.username, AUTH_USERNAME)
     password_correct = _verify_password(credentials.password, AUTH_PASSWORD_HASH)
-    
+
     if not (username_correct and password_correct):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
             headers={"WWW-Authenticate": "Basic"},
         )
+    _auth_cache.set(cache_key, True)
     return credentials.username
 
 # Optional: Disable auth completely (for development)
@@ -157,11 +199,32 @@ GCS_SERVICE_ACCOUNT_PATH = os.getenv('GCS_SERVICE_ACCOUNT_PATH',
 GCS_BUCKET_NAME = os.getenv('GCS_BUCKET_NAME', 'wsi_bucket53')
 gcs_client = None
 
+
+def _tune_gcs_http_pool(client):
+    """Enlarge the client's urllib3 pool (default 10 connections).
+
+    Concurrent tile/range requests otherwise tear down and re-handshake
+    TLS connections to storage.googleapis.com under load.
+    """
+    try:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        adapter = HTTPAdapter(
+            pool_connections=16, pool_maxsize=128,
+            max_retries=Retry(total=5, backoff_factor=0.3,
+                              status_forcelist=(429, 500, 502, 503, 504)))
+        client._http.mount("https://", adapter)
+        client._http.mount("http://", adapter)
+    except Exception as e:
+        print(f"Warning: could not resize GCS connection pool: {e}")
+
+
 if GCS_AVAILABLE:
     if os.path.exists(GCS_SERVICE_ACCOUNT_PATH):
         try:
             credentials = service_account.Credentials.from_service_account_file(GCS_SERVICE_ACCOUNT_PATH)
             gcs_client = storage.Client(credentials=credentials, project=credentials.project_id)
+            _tune_gcs_http_pool(gcs_client)
             print(f"✓ GCS client initialized with credentials for bucket: {GCS_BUCKET_NAME}")
         except Exception as e:
             print(f"Warning: Failed to initialize GCS client with credentials: {e}")
@@ -169,14 +232,135 @@ if GCS_AVAILABLE:
         # Initialize anonymous client for public buckets
         try:
             gcs_client = storage.Client.create_anonymous_client()
+            _tune_gcs_http_pool(gcs_client)
             print(f"✓ GCS anonymous client initialized (for public buckets)")
         except Exception as e:
             print(f"Warning: Failed to initialize anonymous GCS client: {e}")
 else:
     print("GCS features disabled (google-cloud-storage library not installed)")
 
-# Progress tracker (for future features if needed)
-progress_tracker = {}
+# Blob metadata keyed by (bucket, blob_path). Slides are immutable once
+# uploaded, so a generous TTL is safe and saves one metadata RPC per
+# range request (GeoTIFFTileSource issues hundreds per viewport).
+gcs_meta_cache = TTLCache(ttl_seconds=300.0, max_entries=512)
+
+# Slide listings per (bucket, prefix); a minute of staleness is acceptable
+# for the picker UI and avoids a full LIST on every /api/slides hit.
+gcs_listing_cache = TTLCache(ttl_seconds=60.0, max_entries=64)
+
+# Local directory listings keyed by (path, dir mtime): one stat on the
+# directory replaces a scandir + stat per file, and any write to the
+# directory bumps its mtime so the stale entry simply stops matching.
+local_listing_cache = TTLCache(ttl_seconds=30.0, max_entries=256)
+
+# Optional: redirect slide requests to short-lived signed GCS URLs so the
+# browser fetches ranges straight from GCS instead of proxying through us.
+# Requires signing-capable credentials; the proxy path remains the fallback.
+SIGNED_URL_REDIRECT = os.getenv("GCS_SIGNED_URL_REDIRECT", "false").lower() in ("true", "1", "yes")
+
+# Cache signed URLs for less than their validity so a cached URL always
+# has several minutes of life left when handed out.
+signed_url_cache = TTLCache(ttl_seconds=600.0, max_entries=256)
+
+
+# Single-flight map: concurrent identical range requests (OpenSeadragon
+# re-issues overlapping windows during rapid pan/zoom) share one download.
+_inflight_ranges: Dict[tuple, asyncio.Future] = {}
+
+# Byte cache for small hot ranges — in practice the TIFF header/IFD region
+# that GeoTIFFTileSource rereads constantly. Bounded: 256 x <=128 KB.
+RANGE_CACHE_MAX_BYTES = 128 * 1024
+gcs_range_cache = TTLCache(ttl_seconds=60.0, max_entries=256)
+
+
+async def fetch_blob_range(bucket_name: str, blob_path: str, blob,
+                           start: int, end: int) -> bytes:
+    """Download an inclusive byte range, deduplicating concurrent identical
+    fetches and caching small hot ranges."""
+    key = (bucket_name, blob_path, start, end)
+    cacheable = end - start + 1 <= RANGE_CACHE_MAX_BYTES
+    if cacheable:
+        cached = gcs_range_cache.get(key)
+        if cached is not None:
+            return cached
+
+    while True:
+        existing = _inflight_ranges.get(key)
+        if existing is None:
+            break
+        try:
+            return await asyncio.shield(existing)
+        except asyncio.CancelledError:
+            # shield re-raises the leader's cancellation as our own; if
+            # *we* were cancelled, propagate, otherwise fall through and
+            # fetch the range ourselves so one client's mid-pan disconnect
+            # doesn't abort everyone else waiting on the same range.
+            if not existing.cancelled():
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    # Mark any stored exception retrieved so the loop never logs
+    # "exception was never retrieved" when no follower awaited the future.
+    future.add_done_callback(_consume_future_exception)
+    _inflight_ranges[key] = future
+    try:
+        # download_as_bytes takes an inclusive end offset — same semantics
+        # as the HTTP Range values passed in, so no +1 adjustment.
+        content = await run_in_threadpool(
+            blob.download_as_bytes, start=start, end=end)
+        if cacheable:
+            gcs_range_cache.set(key, content)
+        future.set_result(content)
+        return content
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        # A cancelled leader (client disconnect mid-pan) skips both
+        # branches above; cancel the future so followers awaiting it are
+        # released instead of hanging on a forever-pending future.
+        if not future.done():
+            future.cancel()
+        _inflight_ranges.pop(key, None)
+
+
+def _consume_future_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+def get_signed_url_cached(bucket_name: str, blob_path: str, blob) -> Optional[str]:
+    """Signed GET URL for a blob (15 min validity), or None if signing fails."""
+    def _generate():
+        try:
+            return blob.generate_signed_url(
+                version='v4', expiration=timedelta(minutes=15), method='GET')
+        except Exception as e:
+            logger.warning("Cannot sign URL for %s: %s", blob_path, e)
+            return None
+    return signed_url_cache.get_or_compute((bucket_name, blob_path), _generate)
+
+
+def get_blob_meta_cached(bucket_name: str, blob_path: str, blob) -> Tuple[int, Optional[int]]:
+    """Return (size, generation), reloading from GCS only on cache miss."""
+    def _fetch():
+        blob.reload()
+        return (blob.size or 0, blob.generation)
+    return gcs_meta_cache.get_or_compute((bucket_name, blob_path), _fetch)
+
+
+# Slides never change in place, so responses can be cached aggressively;
+# the ETag still lets clients revalidate after eviction.
+SLIDE_CACHE_CONTROL = 'public, max-age=3600, immutable'
+
+
+def etag_for_stat(st) -> str:
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def etag_for_blob(size: int, generation: Optional[int]) -> str:
+    return f'"{generation or 0:x}-{size:x}"'
+
 
 
 def get_session_or_404(token: str):
@@ -204,19 +388,24 @@ def find_file_in_session(session, filename: str):
                 # Check if slide_path is a single file
                 if prefix and "." in prefix.rsplit("/", 1)[-1]:
                     # Single file path
-                    file_name = Path(prefix).name
-                    if file_name == filename:
-                        blob = bucket.blob(prefix)
-                        if blob.exists():
-                            return True, (bucket_name, prefix, blob)
+                    file_name = prefix.rsplit("/", 1)[-1]
+                    if file_name != filename:
+                        continue
+                    blob_path = prefix
                 else:
                     # Directory path
                     blob_path = join_blob_path(prefix, filename)
-                    blob = bucket.blob(blob_path)
-                    if blob.exists():
-                        return True, (bucket_name, blob_path, blob)
+
+                # get_blob: existence check + metadata in one RPC (exists()
+                # costs the same round-trip but discards the metadata)
+                blob = bucket.get_blob(blob_path)
+                if blob is not None:
+                    if blob.size is not None:
+                        gcs_meta_cache.set((bucket_name, blob_path),
+                                           (blob.size, blob.generation))
+                    return True, (bucket_name, blob_path, blob)
             except Exception as e:
-                print(f"Error checking GCS path {slide_path}: {e}")
+                logger.warning("Error checking GCS path %s: %s", slide_path, e)
                 continue
         else:
             # Try local path
@@ -234,34 +423,42 @@ def find_file_in_session(session, filename: str):
     raise HTTPException(status_code=404, detail=f"File not found: {filename}")
 
 
+# All accepted GCS URI/URL shapes in one compiled pattern, so the hot
+# path is a single match instead of a startswith/split ladder.
+_GCS_URI_RE = re.compile(
+    r'^(?:gs|gcs)://(?P<bucket>[^/]+)/?(?P<path>.*)$'
+    r'|^https://storage\.(?:cloud\.google|googleapis)\.com/(?P<bucket2>[^/]+)/?(?P<path2>.*)$'
+)
+
+
 def parse_gcs_location(path: str) -> Tuple[str, str]:
     """Parse a GCS URI/URL into (bucket, object path/prefix)."""
     raw = (path or "").strip()
-    if raw.startswith("gs://") or raw.startswith("gcs://"):
-        without_scheme = raw.split("://", 1)[1]
-        parts = without_scheme.split("/", 1)
-        bucket = parts[0]
-        object_path = parts[1] if len(parts) > 1 else ""
-        return bucket, object_path.strip("/")
-
-    if raw.startswith("https://storage.googleapis.com/"):
-        without_host = raw[len("https://storage.googleapis.com/"):]
-        parts = without_host.split("/", 1)
-        bucket = parts[0]
-        object_path = parts[1] if len(parts) > 1 else ""
-        return bucket, object_path.strip("/")
-
-    if raw.startswith("https://storage.cloud.google.com/"):
-        without_host = raw[len("https://storage.cloud.google.com/"):]
-        parts = without_host.split("/", 1)
-        bucket = parts[0]
-        object_path = parts[1] if len(parts) > 1 else ""
+    m = _GCS_URI_RE.match(raw)
+    if m:
+        bucket = m.group('bucket') or m.group('bucket2')
+        object_path = m.group('path') or m.group('path2') or ""
         return bucket, object_path.strip("/")
 
     # Fallback: treat as bucket-relative path for default configured bucket.
     return GCS_BUCKET_NAME, raw.strip("/")
 
 
+_BUCKET_URL_PREFIX = f'{GCS_BUCKET_NAME}/'
+
+
+def normalize_blob_path(blob_path: str) -> str:
+    """Reduce console/API URL forms to a bucket-relative object path."""
+    if blob_path.startswith('http'):
+        if 'storage.cloud.google.com' in blob_path or 'storage.googleapis.com' in blob_path:
+            parts = blob_path.split(_BUCKET_URL_PREFIX)
+            if len(parts) > 1:
+                blob_path = parts[1]
+    if blob_path.startswith(_BUCKET_URL_PREFIX):
+        blob_path = blob_path[len(_BUCKET_URL_PREFIX):]
+    return blob_path
+
+
 def join_blob_path(prefix: str, filename: str) -> str:
     """Join GCS prefix and filename properly."""
     prefix_clean = (prefix or "").strip("/")
@@ -292,7 +489,7 @@ def get_gcs_blob_for_session(session, filename: str = ""):
 def get_gcs_slide_metadata(bucket_name: str, blob_path: str, blob):
     """Get basic metadata from GCS blob without OpenSlide."""
     return {
-        'filename': Path(blob_path).name,
+        'filename': blob_path.rsplit('/', 1)[-1],
         'size': blob.size or 0,
         'content_type': blob.content_type or 'application/octet-stream',
         'updated': blob.updated.isoformat() if blob.updated else None,
@@ -317,17 +514,273 @@ def ensure_gcs_blob_accessible(session, slide_name: str):
             raise HTTPException(status_code=404, detail=f"File not found: {blob_path}")
         return bucket_name, blob_path, blob
     else:
-        # Try to find slide by name
-        for ext in ALLOWED_EXTENSIONS:
-            test_blob_path = join_blob_path(base_prefix, f"{slide_name}.{ext}")
-            test_blob = bucket.blob(test_blob_path)
-            if test_blob.exists():
-                return bucket_name, test_blob_path, test_blob
+        # Find the slide by name: a single LIST on "<name>." replaces one
+        # HEAD round-trip per allowed extension
+        name_prefix = join_blob_path(base_prefix, f"{slide_name}.")
+        candidates = bucket.list_blobs(prefix=name_prefix,
+                                       fields='items(name,size),nextPageToken')
+        for candidate in candidates:
+            ext = candidate.name[len(name_prefix):]
+            if ext and '.' not in ext and ext.lower() in ALLOWED_EXTENSIONS:
+                return bucket_name, candidate.name, candidate
         raise HTTPException(status_code=404, detail="Slide not found in GCS")
 
 
+# Glob matching any object with an allowed WSI extension ('**' spans '/',
+# so this covers nested prefixes too); used to filter listings server-side.
+_GCS_WSI_GLOB = '**.{' + ','.join(sorted(ALLOWED_EXTENSIONS)) + '}'
+
+
+@functools.lru_cache(maxsize=8192)
 def allowed_file(filename: str) -> bool:
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # Memoized: listings hit the same filenames on every poll
+    i = filename.rfind('.')
+    return i != -1 and filename[i + 1:].lower() in ALLOWED_EXTENSIONS
+
+
+def _download_blob_to_path(blob, local_path: Path, chunk_size: int = 32 * 1024 * 1024) -> None:
+    """Blocking chunked GCS download; run via run_in_threadpool.
+
+    Downloads in resumable chunks into a .part file and renames it into
+    place on success, so a crashed download never leaves a half-written
+    slide behind.
+    """
+    blob.chunk_size = chunk_size
+    part_path = local_path.with_suffix(local_path.suffix + '.part')
+    try:
+        with open(part_path, 'wb') as f:
+            blob.download_to_file(f)
+        os.replace(part_path, local_path)
+    except Exception:
+        part_path.unlink(missing_ok=True)
+        raise
+
+
+# Sliced downloads: blobs bigger than this are fetched as concurrent
+# ranged GETs instead of one single-stream download.
+SLICED_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
+SLICED_DOWNLOAD_CHUNK = 16 * 1024 * 1024
+SLICED_DOWNLOAD_CONCURRENCY = 8
+
+
+async def _download_blob_sliced(blob, local_path: Path, size: int) -> None:
+    """Download a large blob as concurrent ranged GETs.
+
+    Single-stream TCP throughput caps large slide downloads; issuing
+    N ranged reads in parallel and pwrite-ing each slice into a
+    preallocated .part file gets near-linear speedup until the link
+    saturates. Renamed into place on success like _download_blob_to_path.
+    """
+    part_path = local_path.with_suffix(local_path.suffix + '.part')
+    sem = asyncio.Semaphore(SLICED_DOWNLOAD_CONCURRENCY)
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+
+        async def fetch_slice(start: int, end: int):
+            async with sem:
+                data = await asyncio.to_thread(
+                    blob.download_as_bytes, start=start, end=end)
+                os.pwrite(fd, data, start)
+
+        # return_exceptions so gather waits for every slice before we get
+        # control back: the except path closes the fd and unlinks the .part
+        # file, which must not race slices still pwrite-ing into it.
+        results = await asyncio.gather(*[
+            fetch_slice(start, min(start + SLICED_DOWNLOAD_CHUNK - 1, size - 1))
+            for start in range(0, size, SLICED_DOWNLOAD_CHUNK)
+        ], return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        os.close(fd)
+        fd = -1
+        os.replace(part_path, local_path)
+    except Exception:
+        if fd != -1:
+            os.close(fd)
+        part_path.unlink(missing_ok=True)
+        raise
+
+
+def _copy_upload_sync(src, file_path) -> None:
+    """Stream an uploaded file to disk in fixed-size chunks (blocking)."""
+    with open(file_path, 'wb') as f:
+        shutil.copyfileobj(src, f, length=64 * 1024)
+
+
+def _read_file_range(file_path, start: int, end: int) -> bytes:
+    """Blocking range read (inclusive end); run via run_in_threadpool."""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        return f.read(end - start + 1)
+
+
+# Ranges larger than this are streamed in chunks instead of read in one piece,
+# so RSS stays O(chunk) rather than O(range size).
+STREAM_RANGE_THRESHOLD = 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Static header/content-type tables for the raw-slide endpoints, built once
+# instead of per request; handlers layer the dynamic headers on top.
+CONTENT_TYPE_MAP = {
+    'svs': 'image/tiff', 'tif': 'image/tiff', 'tiff': 'image/tiff',
+}
+RAW_SLIDE_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
+    'Access-Control-Allow-Headers': 'Range, Content-Type, Accept',
+    'Access-Control-Expose-Headers': 'Content-Length, Content-Type, Content-Range, Accept-Ranges, ETag',
+    'Accept-Ranges': 'bytes',
+}
+RAW_SLIDE_OPTIONS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
+    'Access-Control-Allow-Headers': 'Range, Content-Type, Accept',
+    'Access-Control-Expose-Headers': 'Content-Length, Content-Type, Content-Range, Accept-Ranges, ETag',
+    'Access-Control-Max-Age': '3600',
+}
+
+
+GCS_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# One range spec, e.g. "0-499", "500-", "-500"
+_RANGE_SPEC_RE = re.compile(r'(\d*)-(\d*)$')
+
+# Refuse absurd multi-range requests outright
+MAX_RANGES_PER_REQUEST = 32
+
+# Multi-range windows narrower than this are fetched from GCS as one
+# bounding read and sliced, instead of one round-trip per range.
+MULTIRANGE_COALESCE_LIMIT = 4 * 1024 * 1024
+
+
+def _parse_range_spec(spec: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """Parse one range spec into inclusive (start, end) against file_size.
+
+    Returns None for malformed or unsatisfiable specs. The end byte is
+    clamped to the file size; suffix ranges ("-N") mean the last N bytes
+    per RFC 7233.
+    """
+    m = _RANGE_SPEC_RE.match(spec)
+    if not m:
+        return None
+    start_s, end_s = m.groups()
+    if not start_s and not end_s:
+        return None
+    if not start_s:
+        # Suffix range: last N bytes
+        length = int(end_s)
+        if length <= 0:
+            return None
+        start = max(0, file_size - length)
+        end = file_size - 1
+    else:
+        start = int(start_s)
+        end = int(end_s) if end_s else file_size - 1
+    if start >= file_size:
+        return None
+    if end >= file_size:
+        end = file_size - 1
+    if start > end:
+        return None
+    return start, end
+
+
+def parse_ranges(range_header: str, file_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parse a Range header (possibly multi-range) into inclusive pairs.
+
+    Returns None if the header is malformed, any spec is unsatisfiable,
+    or there are too many ranges (callers reply 416).
+    """
+    header = range_header.strip()
+    if not header.startswith('bytes='):
+        return None
+    specs = header[len('bytes='):].split(',')
+    if len(specs) > MAX_RANGES_PER_REQUEST:
+        return None
+    ranges = []
+    for spec in specs:
+        parsed = _parse_range_spec(spec.strip(), file_size)
+        if parsed is None:
+            return None
+        ranges.append(parsed)
+    return ranges or None
+
+
+def parse_range(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """Single-range convenience wrapper around parse_ranges."""
+    ranges = parse_ranges(range_header, file_size)
+    if not ranges or len(ranges) != 1:
+        return None
+    return ranges[0]
+
+
+def multipart_range_response(ranges: List[Tuple[int, int]], datas: List[bytes],
+                             content_type: str, file_size: int,
+                             cors_headers: dict) -> Response:
+    """Assemble a 206 multipart/byteranges reply from fetched range bodies."""
+    boundary = secrets.token_hex(16)
+    parts = []
+    for (start, end), data in zip(ranges, datas):
+        parts.append((f'--{boundary}\r\n'
+                      f'Content-Type: {content_type}\r\n'
+                      f'Content-Range: bytes {start}-{end}/{file_size}\r\n'
+                      f'\r\n').encode('ascii'))
+        parts.append(data)
+        parts.append(b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode('ascii'))
+    body = b''.join(parts)
+    headers = {
+        **cors_headers,
+        'Content-Type': f'multipart/byteranges; boundary={boundary}',
+        'Content-Length': str(len(body)),
+    }
+    return Response(content=body, status_code=206, headers=headers)
+
+
+async def fetch_blob_ranges(bucket_name: str, blob_path: str, blob,
+                            ranges: List[Tuple[int, int]]) -> List[bytes]:
+    """Fetch several ranges from one blob, coalescing clustered windows
+    (GeoTIFF IFD reads) into a single GCS round-trip."""
+    lo = min(start for start, _ in ranges)
+    hi = max(end for _, end in ranges)
+    if hi - lo + 1 <= MULTIRANGE_COALESCE_LIMIT:
+        window = await fetch_blob_range(bucket_name, blob_path, blob, lo, hi)
+        return [window[start - lo:end - lo + 1] for start, end in ranges]
+    return [await fetch_blob_range(bucket_name, blob_path, blob, start, end)
+            for start, end in ranges]
+
+
+def _iter_blob_range(blob, start: int, end: int, chunk: int = GCS_STREAM_CHUNK_SIZE):
+    """Yield a byte range (inclusive end) from a GCS blob in chunks.
+
+    Starlette drives sync generators on the threadpool, so the GCS reads
+    never block the event loop, and sending overlaps with downloading.
+    """
+    with blob.open('rb', chunk_size=chunk) as f:
+        if start:
+            f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = f.read(min(chunk, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def _iter_file_range(file_path, start: int, end: int, chunk: int = STREAM_CHUNK_SIZE):
+    """Yield a byte range (inclusive end) from a file in fixed-size chunks."""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = f.read(min(chunk, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
 
 
 # ========================================
@@ -350,6 +803,8 @@ async def create_session(req: CreateSessionRequest, username: str = Depends(get_
     
     overlay_paths = req.overlay if req.overlay else []
     session = session_mgr.create_session(req.slides, overlay_paths)
+    # Warm GCS slide headers in the background; first paint hits the cache
+    asyncio.create_task(_prefetch_session_slides(session))
     return {
         "token": session.token,
         "url": f"/{session.token}/",
@@ -373,139 +828,196 @@ async def heartbeat(token: str):
     session = session_mgr.get_session(token)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return {"status": "ok", "last_accessed": session.last_accessed.isoformat()}
+    session_mgr.invalidate_sessions_view()
+    return {"status": "ok", "last_accessed": session.last_accessed_utc().isoformat()}
 
 
 @app.get("/api/sessions")
 async def list_sessions():
     """List all active sessions."""
-    return {
-        "sessions": [
-            {
-                "token": s.token,
-                "slides_dir": s.slides_dir,
-                "single_slide": s.single_slide,
-                "created_at": s.created_at.isoformat(),
-                "last_accessed": s.last_accessed.isoformat(),
-            }
-            for s in session_mgr.sessions.values()
-        ]
-    }
+    return {"sessions": session_mgr.sessions_view()}
 
 
 # ========================================
 # Session-Scoped: Static Files
 # ========================================
 
+async def _prefetch_session_slides(session):
+    """Warm metadata and header bytes for a session's GCS slides.
+
+    The viewer's first requests after a session opens are the TIFF
+    header/IFD reads at the start of the file; fetching them into the
+    range cache ahead of time makes first paint a cache hit.
+    """
+    if not GCS_AVAILABLE or gcs_client is None:
+        return
+    for slide_path in session.slide_paths:
+        if not is_gcs_path(slide_path):
+            continue
+        try:
+            bucket_name, prefix = parse_gcs_location(slide_path)
+            # Only single-file paths have a known header to warm
+            if not prefix or '.' not in prefix.rsplit('/', 1)[-1]:
+                continue
+            bucket = gcs_client.bucket(bucket_name)
+            blob = bucket.blob(prefix)
+            size, _ = await run_in_threadpool(
+                get_blob_meta_cached, bucket_name, prefix, blob)
+            if size:
+                end = min(RANGE_CACHE_MAX_BYTES, size) - 1
+                await fetch_blob_range(bucket_name, prefix, blob, 0, end)
+        except Exception as e:
+            logger.debug("Slide prefetch failed for %s: %s", slide_path, e)
+
+
+# Assets aren't content-hashed, so cap browser caching at an hour; the
+# ETag/Last-Modified FileResponse emits turns re-fetches into 304s.
+STATIC_ASSET_HEADERS = {'Cache-Control': 'public, max-age=3600'}
+
+
 @app.get("/{token}/")
 async def session_index(token: str):
     """Serve the viewer HTML for a session."""
     get_session_or_404(token)
-    return FileResponse('index.html')
+    # Always revalidated so a restarted server serves fresh markup
+    return FileResponse('index.html', headers={'Cache-Control': 'no-cache'})
 
 
 @app.get("/{token}/styles.css")
 async def session_css(token: str):
     get_session_or_404(token)
-    return FileResponse('styles.css', media_type='text/css')
+    return FileResponse('styles.css', media_type='text/css',
+                        headers=STATIC_ASSET_HEADERS)
 
 
 @app.get("/{token}/viewer.js")
 async def session_js(token: str):
     get_session_or_404(token)
-    return FileResponse('viewer.js', media_type='application/javascript')
+    return FileResponse('viewer.js', media_type='application/javascript',
+                        headers=STATIC_ASSET_HEADERS)
 
 
 # ========================================
 # Session-Scoped: Slide API Endpoints
 # ========================================
 
+async def _scan_slide_path(slide_path: str) -> List[dict]:
+    """Collect slide entries for one slide path (GCS or local)."""
+    if is_gcs_path(slide_path):
+        if not GCS_AVAILABLE or gcs_client is None:
+            logger.warning("GCS path specified but GCS not available: %s", slide_path)
+            return []
+
+        bucket_name, prefix = parse_gcs_location(slide_path)
+        bucket = gcs_client.bucket(bucket_name)
+
+        # Check if this is a direct file path or a directory
+        is_single_file = False
+        if prefix:
+            # Check if it ends with an extension
+            ext = prefix.rsplit(".", 1)[-1].lower() if "." in prefix else ""
+            if ext in ALLOWED_EXTENSIONS:
+                is_single_file = True
+
+        if is_single_file:
+            # Single metadata GET answers existence and size in one
+            # RPC (blob.exists() + blob.size would be two, with size
+            # unpopulated without a reload)
+            blob = await run_in_threadpool(bucket.get_blob, prefix)
+            if blob is None:
+                return []
+            gcs_meta_cache.set((bucket_name, prefix),
+                               (blob.size or 0, blob.generation))
+            filename = prefix.rsplit('/', 1)[-1]
+            return [{
+                'name': filename.rsplit('.', 1)[0],
+                'filename': filename,
+                'size': blob.size or 0,
+                'viewable': True,
+            }]
+
+        # List the directory/prefix once per TTL, trimmed to the
+        # fields we actually use
+        def _list_prefix(bucket=bucket, prefix=prefix):
+            entries = []
+            blobs = bucket.list_blobs(
+                prefix=prefix, page_size=1000,
+                fields='items(name,size),nextPageToken')
+            for blob in blobs:
+                # plain string ops; pathlib objects are
+                # needless overhead at listing scale
+                filename = blob.name.rsplit('/', 1)[-1]
+                if not filename or not allowed_file(filename):
+                    continue
+                entries.append({
+                    'name': filename.rsplit('.', 1)[0],
+                    'filename': filename,
+                    'size': blob.size or 0,
+                    'viewable': True,
+                })
+            return entries
+
+        return await run_in_threadpool(
+            gcs_listing_cache.get_or_compute, (bucket_name, prefix), _list_prefix)
+
+    # Local path
+    p = Path(slide_path)
+    if not p.exists():
+        logger.warning("Local path does not exist: %s", slide_path)
+        return []
+
+    if p.is_file():
+        # Single file
+        if allowed_file(p.name):
+            return [{
+                'name': p.stem,
+                'filename': p.name,
+                'size': p.stat().st_size,
+                'viewable': True,
+            }]
+        return []
+
+    # Directory: one scandir pass; entry objects carry the dirent type
+    # and cache their stat, so this is one syscall per file instead of
+    # three via pathlib
+    def _scan_dir(p=p):
+        entries = []
+        with os.scandir(p) as it:
+            for entry in it:
+                name = entry.name
+                if allowed_file(name) and entry.is_file():
+                    entries.append({
+                        'name': name.rsplit('.', 1)[0],
+                        'filename': name,
+                        'size': entry.stat().st_size,
+                        'viewable': True,
+                    })
+        return entries
+
+    return await run_in_threadpool(
+        local_listing_cache.get_or_compute,
+        (slide_path, p.stat().st_mtime_ns), _scan_dir)
+
+
 @app.get("/{token}/api/slides")
 async def list_slides(token: str):
     """List slides available in this session."""
     session = get_session_or_404(token)
     try:
+        # Scan every slide path concurrently — latency is the max across
+        # paths instead of the sum. gather preserves input order, so the
+        # first-path-wins dedup below matches the old sequential scan.
+        results = await asyncio.gather(
+            *(_scan_slide_path(slide_path) for slide_path in session.slide_paths))
+
         all_slides = []
         seen_filenames = set()  # To deduplicate slides with same filename
-        
-        for slide_path in session.slide_paths:
-            if is_gcs_path(slide_path):
-                if not GCS_AVAILABLE or gcs_client is None:
-                    print(f"Warning: GCS path specified but GCS not available: {slide_path}")
-                    continue
+        for entries in results:
+            for entry in entries:
+                if entry['filename'] not in seen_filenames:
+                    all_slides.append(entry)
+                    seen_filenames.add(entry['filename'])
 
-                bucket_name, prefix = parse_gcs_location(slide_path)
-                bucket = gcs_client.bucket(bucket_name)
-                
-                # Check if this is a direct file path or a directory
-                is_single_file = False
-                if prefix:
-                    # Check if it ends with an extension
-                    ext = prefix.rsplit(".", 1)[-1].lower() if "." in prefix else ""
-                    if ext in ALLOWED_EXTENSIONS:
-                        is_single_file = True
-                
-                if is_single_file:
-                    # Handle single file
-                    blob = bucket.blob(prefix)
-                    if blob.exists():
-                        filename = Path(prefix).name
-                        if filename not in seen_filenames:
-                            stem = Path(filename).stem
-                            all_slides.append({
-                                'name': stem,
-                                'filename': filename,
-                                'size': blob.size or 0,
-                                'viewable': True,
-                            })
-                            seen_filenames.add(filename)
-                else:
-                    # List all files in the directory/prefix
-                    blobs = bucket.list_blobs(prefix=prefix)
-                    for blob in blobs:
-                        filename = Path(blob.name).name
-                        if not filename or not allowed_file(filename):
-                            continue
-                        
-                        if filename not in seen_filenames:
-                            stem = Path(filename).stem
-                            all_slides.append({
-                                'name': stem,
-                                'filename': filename,
-                                'size': blob.size or 0,
-                                'viewable': True,
-                            })
-                            seen_filenames.add(filename)
-            
-            else:
-                # Local path
-                p = Path(slide_path)
-                if not p.exists():
-                    print(f"Warning: Local path does not exist: {slide_path}")
-                    continue
-                
-                if p.is_file():
-                    # Single file
-                    if allowed_file(p.name) and p.name not in seen_filenames:
-                        all_slides.append({
-                            'name': p.stem,
-                            'filename': p.name,
-                            'size': p.stat().st_size,
-                            'viewable': True,
-                        })
-                        seen_filenames.add(p.name)
-                else:
-                    # Directory
-                    for fp in p.iterdir():
-                        if fp.is_file() and allowed_file(fp.name) and fp.name not in seen_filenames:
-                            all_slides.append({
-                                'name': fp.stem,
-                                'filename': fp.name,
-                                'size': fp.stat().st_size,
-                                'viewable': True,
-                            })
-                            seen_filenames.add(fp.name)
-        
         return {"slides": all_slides}
     except HTTPException:
         raise
@@ -525,60 +1037,50 @@ async def get_slide_info(token: str, slide_name: str):
                 try:
                     bucket_name, prefix = parse_gcs_location(slide_path)
                     bucket = gcs_client.bucket(bucket_name)
-                    
-                    # Try to find the slide file
-                    for ext in ALLOWED_EXTENSIONS:
-                        test_blob_path = join_blob_path(prefix, f"{slide_name}.{ext}")
-                        test_blob = bucket.blob(test_blob_path)
-                        if test_blob.exists():
-                            metadata = get_gcs_slide_metadata(bucket_name, test_blob_path, test_blob)
-                            return {
-                                'filename': metadata['filename'],
-                                'size': metadata['size'],
-                                'content_type': metadata['content_type'],
-                                'updated': metadata['updated'],
-                                'properties': {
-                                    'slide_source': 'gcs',
-                                    'bucket': bucket_name,
-                                    'path': test_blob_path
-                                },
-                                'dimensions': [0, 0],
-                                'level_count': 1,
-                            }
-                except Exception as e:
-                    print(f"Error checking GCS path {slide_path}: {e}")
-                    continue
-            else:
-                # Try local path
-                p = Path(slide_path)
-                if p.is_file():
-                    # Single file - check if it matches
-                    if p.stem == slide_name:
-                        return {
-                            'filename': p.name,
-                            'size': p.stat().st_size,
-                            'properties': {
-                                'slide_source': 'local',
-                                'path': str(p)
-                            },
-                            'dimensions': [0, 0],
-                            'level_count': 1,
-                        }
-                else:
-                    # Directory - search for matching file
-                    slide_files = list(p.glob(f"{slide_name}.*"))
-                    if slide_files:
-                        slide_file = slide_files[0]
+
+                    # One LIST on "<name>." replaces a HEAD per allowed
+                    # extension, and its response already carries the
+                    # size/updated/contentType metadata we return
+                    name_prefix = join_blob_path(prefix, f"{slide_name}.")
+                    candidates = await run_in_threadpool(list, bucket.list_blobs(
+                        prefix=name_prefix,
+                        fields='items(name,size,updated,contentType),nextPageToken'))
+                    for candidate in candidates:
+                        ext = candidate.name[len(name_prefix):]
+                        if not ext or '.' in ext or ext.lower() not in ALLOWED_EXTENSIONS:
+                            continue
+                        metadata = get_gcs_slide_metadata(bucket_name, candidate.name, candidate)
                         return {
-                            'filename': slide_file.name,
-                            'size': slide_file.stat().st_size,
+                            'filename': metadata['filename'],
+                            'size': metadata['size'],
+                            'content_type': metadata['content_type'],
+                            'updated': metadata['updated'],
                             'properties': {
-                                'slide_source': 'local',
-                                'path': str(slide_file)
+                                'slide_source': 'gcs',
+                                'bucket': bucket_name,
+                                'path': candidate.name
                             },
                             'dimensions': [0, 0],
                             'level_count': 1,
                         }
+                except Exception as e:
+                    logger.warning("Error checking GCS path %s: %s", slide_path, e)
+                    continue
+            else:
+                # Local paths: O(1) lookup via the per-session slide index
+                local_files = session.local_slide_index().get(slide_name)
+                if local_files:
+                    slide_file = local_files[0]
+                    return {
+                        'filename': slide_file.name,
+                        'size': slide_file.stat().st_size,
+                        'properties': {
+                            'slide_source': 'local',
+                            'path': str(slide_file)
+                        },
+                        'dimensions': [0, 0],
+                        'level_count': 1,
+                    }
         
         raise HTTPException(status_code=404, detail="Slide not found in any configured path")
     except HTTPException:
@@ -616,10 +1118,10 @@ async def upload_file(token: str, file: UploadFile = File(...)):
         upload_dir.mkdir(exist_ok=True)
         file_path = upload_dir / file.filename
 
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # Stream to disk in chunks instead of buffering the whole slide in RAM
+        await run_in_threadpool(_copy_upload_sync, file.file, file_path)
 
+        session.invalidate_slide_index()
         return {'success': True, 'filename': file.filename, 'name': file_path.stem}
     except HTTPException:
         raise
@@ -627,36 +1129,29 @@ async def upload_file(token: str, file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _unlink_slide_files(files: List[Path]):
+    """Remove slide files; runs as a background task off the request path."""
+    for sf in files:
+        try:
+            sf.unlink()
+        except OSError as e:
+            logger.warning("Failed to delete %s: %s", sf, e)
+
+
 @app.delete("/{token}/api/delete/{slide_name}")
-async def delete_slide(token: str, slide_name: str):
+async def delete_slide(token: str, slide_name: str, background_tasks: BackgroundTasks):
     """Delete a slide (local files only, not supported for GCS)."""
     session = get_session_or_404(token)
-    
+
     try:
-        # Search all local slide paths for the file
-        deleted = False
-        for slide_path in session.slide_paths:
-            if is_gcs_path(slide_path):
-                continue  # Skip GCS paths
-            
-            p = Path(slide_path)
-            if p.is_dir():
-                slide_files = list(p.glob(f"{slide_name}.*"))
-                if slide_files:
-                    for sf in slide_files:
-                        sf.unlink()
-                    deleted = True
-                    break
-            else:
-                # Single file
-                if p.stem == slide_name:
-                    p.unlink()
-                    deleted = True
-                    break
-        
-        if not deleted:
+        # O(1) lookup via the per-session slide index (local files only)
+        slide_files = session.local_slide_index().get(slide_name)
+        if not slide_files:
             raise HTTPException(status_code=404, detail="Slide not found or is in GCS (delete not supported)")
-        
+
+        # Unlink after the response is sent; sync tasks run on the threadpool
+        background_tasks.add_task(_unlink_slide_files, slide_files)
+        session.invalidate_slide_index()
         return {'success': True, 'message': 'Slide deleted'}
     except HTTPException:
         raise
@@ -665,13 +1160,46 @@ async def delete_slide(token: str, slide_name: str):
 
 @app.options("/{token}/api/raw_slides/{filename:path}")
 async def options_raw_slide(token: str, filename: str):
-    return Response(status_code=200, headers={
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
-        'Access-Control-Allow-Headers': 'Range, Content-Type, Accept',
-        'Access-Control-Expose-Headers': 'Content-Length, Content-Type, Content-Range, Accept-Ranges',
-        'Access-Control-Max-Age': '3600'
-    })
+    return Response(status_code=200, headers=RAW_SLIDE_OPTIONS_HEADERS)
+
+
+async def _resolve_raw_slide(session, filename: str):
+    """Locate a slide and gather the metadata HEAD and GET both need.
+
+    Returns (is_gcs, location, file_size, etag, content_type). Metadata
+    comes from the TTL caches, so a viewer's HEAD primes the immediately
+    following GET. Raises 404 if missing/empty and 403 if a local file
+    escapes the session's slide roots.
+    """
+    ext = filename.rsplit('.', 1)[-1].lower() if "." in filename else ""
+    content_type = CONTENT_TYPE_MAP.get(ext, 'application/octet-stream')
+
+    is_gcs, location = await run_in_threadpool(find_file_in_session, session, filename)
+
+    if is_gcs:
+        bucket_name, blob_path, blob = location
+        # Size comes from the TTL cache; only a miss hits GCS metadata
+        file_size, generation = await run_in_threadpool(
+            get_blob_meta_cached, bucket_name, blob_path, blob)
+        if not file_size or file_size == 0:
+            raise HTTPException(status_code=404, detail="File not found or empty")
+        etag = etag_for_blob(file_size, generation)
+    else:
+        # Security check: the file must live under one of the session's
+        # local slide paths. Roots are resolved once per session, so the
+        # per-request cost is one realpath + string prefix compares.
+        resolved_file = os.path.realpath(location)
+        is_authorized = any(
+            resolved_file == root or resolved_file.startswith(root + os.sep)
+            for root in session.local_roots_resolved()
+        )
+        if not is_authorized:
+            raise HTTPException(status_code=403, detail="Access denied")
+        st = await run_in_threadpool(location.stat)
+        file_size = st.st_size
+        etag = etag_for_stat(st)
+
+    return is_gcs, location, file_size, etag, content_type
 
 
 @app.head("/{token}/api/raw_slides/{filename:path}")
@@ -679,37 +1207,18 @@ async def head_raw_slide(token: str, filename: str):
     """Handle HEAD requests for GeoTIFFTileSource compatibility."""
     session = get_session_or_404(token)
     try:
-        is_gcs, location = find_file_in_session(session, filename)
-        
-        if is_gcs:
-            _, _, blob = location
-            blob.reload()  # Force reload to get size
-            file_size = blob.size
-            if not file_size or file_size == 0:
-                raise HTTPException(status_code=404, detail=f"File not found or empty")
-            print(f"HEAD request - GCS file size: {file_size}")
-        else:
-            file_path = location
-            file_size = file_path.stat().st_size
-        
-        ext = filename.rsplit('.', 1)[-1].lower() if "." in filename else ""
-        content_type_map = {
-            'svs': 'image/tiff', 'tif': 'image/tiff', 'tiff': 'image/tiff',
-        }
-        content_type = content_type_map.get(ext, 'application/octet-stream')
-        
+        _, _, file_size, etag, content_type = await _resolve_raw_slide(session, filename)
         return Response(status_code=200, headers={
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
-            'Access-Control-Expose-Headers': 'Content-Length, Content-Type, Accept-Ranges',
-            'Accept-Ranges': 'bytes',
+            **RAW_SLIDE_CORS_HEADERS,
             'Content-Type': content_type,
-            'Content-Length': str(file_size)
+            'Content-Length': str(file_size),
+            'ETag': etag,
+            'Cache-Control': SLIDE_CACHE_CONTROL
         })
     except HTTPException:
         raise
     except Exception as e:
-        print(f"HEAD error: {e}")
+        logger.warning("HEAD error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -718,161 +1227,108 @@ async def serve_raw_slide(token: str, filename: str, request: Request):
     """Serve raw slide files with range request support (CORS proxy for GCS, direct serve for local)."""
     session = get_session_or_404(token)
     try:
-        ext = filename.rsplit('.', 1)[-1].lower() if "." in filename else ""
-        content_type_map = {
-            'svs': 'image/tiff', 'tif': 'image/tiff', 'tiff': 'image/tiff',
-        }
-        content_type = content_type_map.get(ext, 'application/octet-stream')
+        is_gcs, location, file_size, etag, content_type = await _resolve_raw_slide(
+            session, filename)
 
-        cors_headers = {
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
-            'Access-Control-Allow-Headers': 'Range, Content-Type, Accept',
-            'Access-Control-Expose-Headers': 'Content-Length, Content-Type, Content-Range, Accept-Ranges',
-            'Accept-Ranges': 'bytes',
-            'Content-Type': content_type
-        }
+        cors_headers = {**RAW_SLIDE_CORS_HEADERS, 'Content-Type': content_type,
+                        'ETag': etag, 'Cache-Control': SLIDE_CACHE_CONTROL}
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=cors_headers)
 
-        # Find file across all slide paths
-        is_gcs, location = find_file_in_session(session, filename)
-        
         if is_gcs:
             # GCS files: proxy with range request support
-            _, _, blob = location
-            
-            # Reload blob to get size
-            blob.reload()
-            file_size = blob.size
-            
-            if not file_size or file_size == 0:
-                raise HTTPException(status_code=404, detail=f"File not found or empty")
-            
-            print(f"GCS file size: {file_size}")
+            bucket_name, blob_path, blob = location
+
+            # If enabled, hand the browser a signed URL and let it pull
+            # ranges straight from GCS (native Range support there)
+            if SIGNED_URL_REDIRECT:
+                signed_url = await run_in_threadpool(
+                    get_signed_url_cached, bucket_name, blob_path, blob)
+                if signed_url:
+                    # The Location is only signed for minutes, so the
+                    # redirect must not inherit the immutable slide
+                    # Cache-Control or browsers replay it after expiry.
+                    return Response(status_code=302,
+                                    headers={**cors_headers, 'Location': signed_url,
+                                             'Cache-Control': 'private, max-age=60'})
+
+            logger.debug("GCS file size: %s", file_size)
             range_header = request.headers.get('range')
-            
+
             if range_header:
-                range_match = range_header.replace('bytes=', '').split('-')
-                start = int(range_match[0]) if range_match[0] else 0
-                end = int(range_match[1]) if len(range_match) > 1 and range_match[1] else file_size - 1
-                
-                print(f"GCS Range: {range_header} | Size: {file_size} | Start: {start}, End: {end}")
-                
-                # Validate start position
-                if start >= file_size or start < 0:
-                    print(f"❌ Invalid start: {start}, size={file_size}")
-                    return Response(status_code=416, headers={
-                        **cors_headers, 
-                        'Content-Range': f'bytes */{file_size}'
-                    })
-                
-                # Clamp end to file size - 1 (inclusive end byte)
-                if end >= file_size:
-                    print(f"⚠️  End {end} exceeds file size {file_size}, clamping to {file_size - 1}")
-                    end = file_size - 1
-                
-                if start > end:
-                    print(f"❌ Invalid: start > end ({start} > {end})")
+                ranges = parse_ranges(range_header, file_size)
+                if ranges is None:
+                    logger.debug("Unsatisfiable range: %s (size=%s)", range_header, file_size)
                     return Response(status_code=416, headers={
-                        **cors_headers, 
+                        **cors_headers,
                         'Content-Range': f'bytes */{file_size}'
                     })
-                
-                # GCS download_as_bytes uses inclusive start, exclusive end
-                # So end + 1 for the GCS API call
-                print(f"✅ Valid range, downloading bytes {start}-{end}")
-                content = blob.download_as_bytes(start=start, end=end + 1)
-                print(f"✅ Downloaded {len(content)} bytes")
-                return Response(content=content, status_code=206, headers={
-                    **cors_headers, 
-                    'Content-Length': str(len(content)),
+                if len(ranges) > 1:
+                    datas = await fetch_blob_ranges(bucket_name, blob_path, blob, ranges)
+                    return multipart_range_response(ranges, datas, content_type,
+                                                    file_size, cors_headers)
+                start, end = ranges[0]
+                logger.debug("Downloading GCS bytes %s-%s", start, end)
+                range_headers = {
+                    **cors_headers,
+                    'Content-Length': str(end - start + 1),
                     'Content-Range': f'bytes {start}-{end}/{file_size}'
+                }
+                if end - start + 1 > STREAM_RANGE_THRESHOLD:
+                    # Large range: stream so we never hold it all in RAM
+                    return StreamingResponse(_iter_blob_range(blob, start, end),
+                                             status_code=206, headers=range_headers)
+                # Coalesced + cached small-range fetch (single-flight)
+                content = await fetch_blob_range(bucket_name, blob_path, blob, start, end)
+                logger.debug("Downloaded %s bytes", len(content))
+                return Response(content=content, status_code=206, headers=range_headers)
+
+            # Full-file request: stream instead of buffering the whole blob
+            return StreamingResponse(
+                _iter_blob_range(blob, 0, file_size - 1),
+                status_code=200, headers={
+                    **cors_headers,
+                    'Content-Length': str(file_size),
+                    'Content-Disposition': f'inline; filename="{Path(blob.name).name}"'
                 })
-
-            content = blob.download_as_bytes()
-            return Response(content=content, status_code=200, headers={
-                **cors_headers,
-                'Content-Length': str(file_size),
-                'Content-Disposition': f'inline; filename="{Path(blob.name).name}"'
-            })
         else:
-            # Local files: serve with range request support
+            # Local files: serve with range request support (resolution
+            # already authorized the path against the session roots)
             file_path = location
-            
-            # Security check: ensure file is in one of the authorized slide paths
-            is_authorized = False
-            resolved_file = file_path.resolve()
-            for slide_path in session.slide_paths:
-                if not is_gcs_path(slide_path):
-                    resolved_slide_path = Path(slide_path).resolve()
-                    if resolved_slide_path.is_file():
-                        # If slide_path is a file, check if it's the same file
-                        if resolved_file == resolved_slide_path:
-                            is_authorized = True
-                            break
-                    else:
-                        # If slide_path is a directory, check if file is within it
-                        try:
-                            if hasattr(resolved_file, 'is_relative_to'):
-                                if resolved_file.is_relative_to(resolved_slide_path):
-                                    is_authorized = True
-                                    break
-                            else:
-                                # Fallback for Python < 3.9
-                                try:
-                                    resolved_file.relative_to(resolved_slide_path)
-                                    is_authorized = True
-                                    break
-                                except ValueError:
-                                    pass
-                        except:
-                            pass
-            
-            if not is_authorized:
-                raise HTTPException(status_code=403, detail="Access denied")
-
-            file_size = file_path.stat().st_size
-            print(f"Local file size: {file_size}")
+            logger.debug("Local file size: %s", file_size)
             range_header = request.headers.get('range')
             
             if range_header:
-                range_match = range_header.replace('bytes=', '').split('-')
-                start = int(range_match[0]) if range_match[0] else 0
-                end = int(range_match[1]) if len(range_match) > 1 and range_match[1] else file_size - 1
-                
-                print(f"Local Range: {range_header} | Size: {file_size} | Start: {start}, End: {end}")
-                
-                # Validate start position
-                if start >= file_size or start < 0:
-                    print(f"❌ Invalid start: {start}, size={file_size}")
+                ranges = parse_ranges(range_header, file_size)
+                if ranges is None:
+                    logger.debug("Unsatisfiable range: %s (size=%s)", range_header, file_size)
                     return Response(status_code=416, headers={
-                        **cors_headers, 
+                        **cors_headers,
                         'Content-Range': f'bytes */{file_size}'
                     })
-                
-                # Clamp end to file size - 1 (inclusive end byte)
-                if end >= file_size:
-                    print(f"⚠️  End {end} exceeds file size {file_size}, clamping to {file_size - 1}")
-                    end = file_size - 1
-                
-                if start > end:
-                    print(f"❌ Invalid: start > end ({start} > {end})")
-                    return Response(status_code=416, headers={
-                        **cors_headers, 
-                        'Content-Range': f'bytes */{file_size}'
-                    })
-                
-                print(f"✅ Valid range, reading bytes {start}-{end}")
-                with open(file_path, 'rb') as f:
-                    f.seek(start)
-                    content = f.read(end - start + 1)
-                print(f"✅ Read {len(content)} bytes")
-                return Response(content=content, status_code=206, headers={
-                    **cors_headers, 
-                    'Content-Length': str(len(content)),
+                if len(ranges) > 1:
+                    datas = await asyncio.gather(*[
+                        run_in_threadpool(_read_file_range, file_path, start, end)
+                        for start, end in ranges
+                    ])
+                    return multipart_range_response(ranges, list(datas), content_type,
+                                                    file_size, cors_headers)
+                start, end = ranges[0]
+                logger.debug("Reading local bytes %s-%s", start, end)
+                range_headers = {
+                    **cors_headers,
+                    'Content-Length': str(end - start + 1),
                     'Content-Range': f'bytes {start}-{end}/{file_size}'
-                })
+                }
+                if end - start + 1 > STREAM_RANGE_THRESHOLD:
+                    # Large range: stream in chunks so we never hold it all in RAM
+                    return StreamingResponse(_iter_file_range(file_path, start, end),
+                                             status_code=206, headers=range_headers)
+                content = await run_in_threadpool(_read_file_range, file_path, start, end)
+                logger.debug("Read %s bytes", len(content))
+                return Response(content=content, status_code=206, headers=range_headers)
             else:
-                print(f"No range header, serving full file")
+                logger.debug("No range header, serving full file")
                 return FileResponse(path=str(file_path), media_type=content_type, headers=cors_headers)
     except HTTPException:
         raise
@@ -884,9 +1340,13 @@ async def serve_raw_slide(token: str, filename: str, request: Request):
 async def get_overlay_config(token: str, slide_name: str):
     """Get per-slide overlay configuration."""
     session = get_session_or_404(token)
-    density = session.find_overlay_file(slide_name, '_density.png')
-    metadata = session.find_overlay_file(slide_name, '_metadata.json')
-    grid = session.find_overlay_file(slide_name, '_grid.json')
+    # The three lookups each stat the overlay/slide dirs; run them
+    # concurrently so latency is max(T) instead of 3xT
+    density, metadata, grid = await asyncio.gather(
+        asyncio.to_thread(session.find_overlay_file, slide_name, '_density.png'),
+        asyncio.to_thread(session.find_overlay_file, slide_name, '_metadata.json'),
+        asyncio.to_thread(session.find_overlay_file, slide_name, '_grid.json'),
+    )
     available = density is not None and metadata is not None
     return {
         "available": available,
@@ -897,7 +1357,7 @@ async def get_overlay_config(token: str, slide_name: str):
 
 
 @app.get("/{token}/api/overlay-file/{filename}")
-async def serve_overlay_file(token: str, filename: str):
+async def serve_overlay_file(token: str, filename: str, request: Request):
     """Serve an overlay file from overlay dir or slides dir."""
     session = get_session_or_404(token)
     for suffix in ['_density.png', '_metadata.json', '_grid.json']:
@@ -905,8 +1365,16 @@ async def serve_overlay_file(token: str, filename: str):
             slide_name = filename[:-len(suffix)]
             file_path = session.find_overlay_file(slide_name, suffix)
             if file_path:
+                # Overlays rarely change between pans; an mtime/size ETag
+                # lets repeat viewport loads revalidate without re-reading
+                # the file from disk.
+                st = await run_in_threadpool(os.stat, file_path)
+                etag = etag_for_stat(st)
+                headers = {'ETag': etag, 'Cache-Control': 'public, max-age=3600'}
+                if request.headers.get('if-none-match') == etag:
+                    return Response(status_code=304, headers=headers)
                 media_type = 'image/png' if suffix.endswith('.png') else 'application/json'
-                return FileResponse(file_path, media_type=media_type)
+                return FileResponse(file_path, media_type=media_type, headers=headers)
             break
     raise HTTPException(status_code=404, detail=f"Overlay file not found: {filename}")
 
@@ -923,22 +1391,16 @@ async def download_gcs_file(blob_path: str = Query(..., description="Path to blo
     if gcs_client is None:
         raise HTTPException(status_code=503, detail="GCS client not initialized")
     try:
-        original_blob_path = blob_path
-        if blob_path.startswith('http'):
-            if 'storage.cloud.google.com' in blob_path or 'storage.googleapis.com' in blob_path:
-                parts = blob_path.split(f'{GCS_BUCKET_NAME}/')
-                if len(parts) > 1:
-                    blob_path = parts[1]
-        if blob_path.startswith(f'{GCS_BUCKET_NAME}/'):
-            blob_path = blob_path[len(f'{GCS_BUCKET_NAME}/'):]
+        blob_path = normalize_blob_path(blob_path)
 
         bucket = gcs_client.bucket(GCS_BUCKET_NAME)
-        blob = bucket.blob(blob_path)
-        if not blob.exists():
+        # get_blob does existence check + metadata (size) in one RPC
+        blob = await run_in_threadpool(bucket.get_blob, blob_path)
+        if blob is None:
             raise HTTPException(status_code=404, detail=f"File not found: {blob_path}")
 
-        filename = blob_path.split('/')[-1]
-        slide_name = Path(filename).stem
+        filename = blob_path.rsplit('/', 1)[-1]
+        slide_name = filename.rsplit('.', 1)[0]
         upload_dir = Path("uploads")
         upload_dir.mkdir(exist_ok=True)
         local_path = upload_dir / filename
@@ -947,9 +1409,12 @@ async def download_gcs_file(blob_path: str = Query(..., description="Path to blo
             return {'success': True, 'filename': filename, 'name': slide_name,
                     'message': 'File already exists locally', 'downloaded': False}
 
-        print(f"Downloading {filename} from GCS...")
-        blob.download_to_filename(str(local_path))
-        print(f"✓ Downloaded {filename} to {local_path}")
+        logger.info("Downloading %s from GCS...", filename)
+        if blob.size and blob.size > SLICED_DOWNLOAD_THRESHOLD:
+            await _download_blob_sliced(blob, local_path, blob.size)
+        else:
+            await run_in_threadpool(_download_blob_to_path, blob, local_path)
+        logger.info("Downloaded %s to %s", filename, local_path)
         return {'success': True, 'filename': filename, 'name': slide_name,
                 'size': local_path.stat().st_size, 'downloaded': True}
     except HTTPException:
@@ -959,30 +1424,75 @@ async def download_gcs_file(blob_path: str = Query(..., description="Path to blo
 
 
 @app.get("/api/gcs/proxy/{blob_path:path}")
-async def proxy_gcs_file(blob_path: str):
+async def proxy_gcs_file(blob_path: str, request: Request):
     """Proxy GCS file through server to avoid CORS issues."""
     if not GCS_AVAILABLE or gcs_client is None:
         raise HTTPException(status_code=503, detail="GCS features not available")
     try:
-        if blob_path.startswith('http'):
-            if 'storage.cloud.google.com' in blob_path or 'storage.googleapis.com' in blob_path:
-                parts = blob_path.split(f'{GCS_BUCKET_NAME}/')
-                if len(parts) > 1:
-                    blob_path = parts[1]
-        if blob_path.startswith(f'{GCS_BUCKET_NAME}/'):
-            blob_path = blob_path[len(f'{GCS_BUCKET_NAME}/'):]
+        blob_path = normalize_blob_path(blob_path)
 
         bucket = gcs_client.bucket(GCS_BUCKET_NAME)
-        blob = bucket.blob(blob_path)
-        if not blob.exists():
+        # get_blob does existence check + metadata fetch in one RPC
+        blob = await run_in_threadpool(bucket.get_blob, blob_path)
+        if blob is None:
             raise HTTPException(status_code=404, detail=f"File not found: {blob_path}")
 
-        content = blob.download_as_bytes()
         content_type = blob.content_type or 'application/octet-stream'
-        return Response(content=content, media_type=content_type, headers={
+        etag = etag_for_blob(blob.size or 0, blob.generation)
+        base_headers = {
             'Access-Control-Allow-Origin': '*',
-            'Content-Disposition': f'inline; filename="{blob_path.split("/")[-1]}"'
-        })
+            'Accept-Ranges': 'bytes',
+            'ETag': etag,
+            'Cache-Control': SLIDE_CACHE_CONTROL,
+            'Content-Disposition': f'inline; filename="{blob_path.rsplit("/", 1)[-1]}"'
+        }
+
+        # Generation-based conditional GET: matching clients get a 304
+        # before any object bytes are requested from GCS.
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=base_headers)
+
+        # Partial content: tile/IFD reads from OpenSeadragon come in as
+        # Range requests; serve just those bytes instead of the whole slide.
+        range_header = request.headers.get('range')
+        if range_header:
+            ranges = parse_ranges(range_header, blob.size)
+            if ranges is None:
+                raise HTTPException(status_code=416, detail="Invalid range",
+                                    headers={'Content-Range': f'bytes */{blob.size}'})
+            if len(ranges) > 1:
+                datas = await fetch_blob_ranges(GCS_BUCKET_NAME, blob_path, blob, ranges)
+                return multipart_range_response(ranges, datas, content_type,
+                                                blob.size, base_headers)
+            start, end = ranges[0]
+            headers = dict(base_headers)
+            headers['Content-Range'] = f'bytes {start}-{end}/{blob.size}'
+            if end - start + 1 > STREAM_RANGE_THRESHOLD:
+                headers['Content-Length'] = str(end - start + 1)
+                return StreamingResponse(_iter_blob_range(blob, start, end),
+                                         status_code=206, media_type=content_type,
+                                         headers=headers)
+            data = await fetch_blob_range(GCS_BUCKET_NAME, blob_path, blob, start, end)
+            return Response(content=data, status_code=206,
+                            media_type=content_type, headers=headers)
+
+        # Full-object reads can skip the proxy entirely: hand back a
+        # short-lived signed URL and let the client pull from GCS directly.
+        if SIGNED_URL_REDIRECT:
+            signed_url = await run_in_threadpool(
+                get_signed_url_cached, GCS_BUCKET_NAME, blob_path, blob)
+            if signed_url:
+                return Response(status_code=307,
+                                headers={'Location': signed_url,
+                                         'Cache-Control': 'private, max-age=60'})
+
+        # Stream instead of buffering the whole object; memory stays bounded
+        # to one chunk and first bytes go out while the rest downloads.
+        headers = dict(base_headers)
+        headers['Content-Length'] = str(blob.size)
+        return StreamingResponse(
+            _iter_blob_range(blob, 0, blob.size - 1, chunk=4 * 1024 * 1024),
+            media_type=content_type, headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -996,16 +1506,31 @@ async def list_gcs_files(prefix: Optional[str] = Query(None)):
         raise HTTPException(status_code=503, detail="GCS features not available")
     try:
         bucket = gcs_client.bucket(GCS_BUCKET_NAME)
-        blobs = bucket.list_blobs(prefix=prefix)
+
+        # Trim the listing to the fields we return and fetch bigger pages;
+        # match_glob pushes the extension filter server-side so non-WSI
+        # objects never cross the wire. Iterate on the threadpool so the
+        # handler doesn't block on network.
+        def _list():
+            try:
+                return list(bucket.list_blobs(
+                    prefix=prefix, page_size=1000, match_glob=_GCS_WSI_GLOB,
+                    fields='items(name,size,updated),nextPageToken'))
+            except TypeError:
+                # Older client without match_glob; fall back to full listing
+                # (allowed_file below still filters client-side)
+                return list(bucket.list_blobs(
+                    prefix=prefix, page_size=1000,
+                    fields='items(name,size,updated),nextPageToken'))
+
+        blobs = await run_in_threadpool(_list)
         files = []
         for blob in blobs:
-            if '.' in blob.name:
-                ext = blob.name.rsplit('.', 1)[1].lower()
-                if ext in ALLOWED_EXTENSIONS:
-                    files.append({
-                        'name': blob.name.split('/')[-1], 'path': blob.name,
-                        'size': blob.size, 'updated': blob.updated.isoformat() if blob.updated else None
-                    })
+            if allowed_file(blob.name):
+                files.append({
+                    'name': blob.name.rsplit('/', 1)[-1], 'path': blob.name,
+                    'size': blob.size, 'updated': blob.updated.isoformat() if blob.updated else None
+                })
         return {'files': files}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list GCS files: {str(e)}")
@@ -1041,26 +1566,38 @@ async def get_gcs_signed_url(blob_path: str = Query(...), expiration_hours: int
     if gcs_client is None:
         raise HTTPException(status_code=503, detail="GCS client not initialized")
     try:
-        if blob_path.startswith('http'):
-            parts = blob_path.split(f'{GCS_BUCKET_NAME}/')
-            if len(parts) > 1:
-                blob_path = parts[1]
-        if blob_path.startswith(f'{GCS_BUCKET_NAME}/'):
-            blob_path = blob_path[len(f'{GCS_BUCKET_NAME}/'):]
+        blob_path = normalize_blob_path(blob_path)
 
         bucket = gcs_client.bucket(GCS_BUCKET_NAME)
-        blob = bucket.blob(blob_path)
-        if not blob.exists():
-            raise HTTPException(status_code=404, detail=f"File not found: {blob_path}")
-
-        from datetime import timedelta
-        expiration = datetime.utcnow() + timedelta(hours=expiration_hours)
-        signed_url = blob.generate_signed_url(expiration=expiration, method='GET', version='v4')
-        filename = blob_path.split('/')[-1]
+        # Skip the existence HEAD when recent metadata is already cached
+        if gcs_meta_cache.get((GCS_BUCKET_NAME, blob_path)) is not None:
+            blob = bucket.blob(blob_path)
+        else:
+            blob = await run_in_threadpool(bucket.get_blob, blob_path)
+            if blob is None:
+                raise HTTPException(status_code=404, detail=f"File not found: {blob_path}")
+            if blob.size is not None:
+                gcs_meta_cache.set((GCS_BUCKET_NAME, blob_path),
+                                   (blob.size, blob.generation))
+
+        # Amortize the RSA sign + canonical-string work across requests;
+        # key includes the horizon so 24h URLs don't collide with the
+        # short-lived redirect URLs.
+        def _sign():
+            expiration = datetime.utcnow() + timedelta(hours=expiration_hours)
+            url = blob.generate_signed_url(
+                expiration=expiration, method='GET', version='v4')
+            return url, expiration.isoformat()
+
+        signed_url, expires_at = await run_in_threadpool(
+            signed_url_cache.get_or_compute,
+            (GCS_BUCKET_NAME, blob_path, expiration_hours), _sign)
+        filename = blob_path.rsplit('/', 1)[-1]
+        stem, _, ext = filename.rpartition('.')
         return {
             'success': True, 'signed_url': signed_url, 'filename': filename,
-            'name': Path(filename).stem, 'expires_at': expiration.isoformat(),
-            'is_directly_viewable': Path(filename).suffix.lower() in ['.svs', '.tif', '.tiff']
+            'name': stem or filename, 'expires_at': expires_at,
+            'is_directly_viewable': ext.lower() in ('svs', 'tif', 'tiff')
         }
     except HTTPException:
         raise
@@ -1077,6 +1614,7 @@ async def startup_event():
     """Create default session from CLI args and start cleanup loop."""
     # Create default session from CLI arguments
     default_session = session_mgr.create_session(slide_paths, overlay_paths)
+    asyncio.create_task(_prefetch_session_slides(default_session))
 
     # Start background cleanup
     await session_mgr.start_cleanup_loop(interval_minutes=5)
@@ -4,29 +4,41 @@ Manages multiple viewer sessions with UUID tokens, each with its own
 slides directory and overlay directory.
 """
 
+import os
+import sys
+import time
 import uuid
+import heapq
 import asyncio
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List
 
 
-ALLOWED_EXTENSIONS = {
+ALLOWED_EXTENSIONS = frozenset({
     'svs', 'tif', 'tiff', 'vms', 'vmu', 'ndpi',
     'scn', 'mrxs', 'svslide', 'bif'
-}
+})
+
+
+# startswith accepts a tuple, so one C-level call covers every scheme
+_GCS_PREFIXES = (
+    "gs://",
+    "gcs://",
+    "https://storage.googleapis.com/",
+    "https://storage.cloud.google.com/",
+)
 
 
 def is_gcs_path(path: str) -> bool:
     """Return True if a path points to GCS-style location."""
-    p = (path or "").strip().lower()
-    return (
-        p.startswith("gs://")
-        or p.startswith("gcs://")
-        or p.startswith("https://storage.googleapis.com/")
-        or p.startswith("https://storage.cloud.google.com/")
-    )
+    if not path:
+        return False
+    p = path.strip()
+    # Fast path: URI schemes/hosts are lowercase in practice; only pay
+    # for the lowercased copy when the cheap check misses.
+    return p.startswith(_GCS_PREFIXES) or p.lower().startswith(_GCS_PREFIXES)
 
 
 @dataclass
@@ -35,41 +47,121 @@ class Session:
     token: str
     slide_paths: List[str]  # List of slide paths (GCS URLs or local paths)
     overlay_paths: List[str]  # List of overlay directories
-    last_accessed: datetime = field(default_factory=datetime.utcnow)
+    # Monotonic stamp: touch() runs on every request, and monotonic is
+    # allocation-free and immune to NTP jumps that could expire sessions
+    # early; created_at stays a datetime since it's display-only.
+    last_accessed_mono: float = field(default_factory=time.monotonic)
     created_at: datetime = field(default_factory=datetime.utcnow)
+    _slide_index: Optional[Dict[str, List[Path]]] = field(default=None, repr=False)
+    _slide_index_state: Optional[List[Optional[int]]] = field(default=None, repr=False)
+    _local_roots: Optional[List[str]] = field(default=None, repr=False)
+    _overlay_index: Optional[Dict[str, str]] = field(default=None, repr=False)
+    _overlay_index_state: Optional[List[Optional[int]]] = field(default=None, repr=False)
 
     def touch(self):
-        self.last_accessed = datetime.utcnow()
+        self.last_accessed_mono = time.monotonic()
 
-    def find_overlay_file(self, slide_name: str, suffix: str) -> Optional[str]:
-        """Find overlay file: search all overlay paths in order."""
-        target = f"{slide_name}{suffix}"
-        
-        # Search all overlay directories
+    def last_accessed_utc(self) -> datetime:
+        """Wall-clock view of the monotonic last-access stamp, for APIs."""
+        idle = time.monotonic() - self.last_accessed_mono
+        return datetime.utcnow() - timedelta(seconds=idle)
+
+    def local_slide_index(self) -> Dict[str, List[Path]]:
+        """Map slide stem -> matching files, built lazily across local paths.
+
+        The first slide path containing a given stem wins (same precedence
+        as scanning the paths in order). Like the overlay index, the built
+        index is revalidated against the paths' mtimes, so files that
+        appear out of band — e.g. a GCS download landing in uploads/ —
+        show up without an explicit invalidation.
+        """
+        state: List[Optional[int]] = []
+        for slide_path in self.slide_paths:
+            if is_gcs_path(slide_path):
+                state.append(None)
+                continue
+            try:
+                state.append(os.stat(slide_path).st_mtime_ns)
+            except OSError:
+                state.append(None)
+
+        if self._slide_index is None or state != self._slide_index_state:
+            index: Dict[str, List[Path]] = {}
+            for slide_path in self.slide_paths:
+                if is_gcs_path(slide_path):
+                    continue
+                p = Path(slide_path)
+                per_path: Dict[str, List[Path]] = {}
+                if p.is_file():
+                    per_path[p.stem] = [p]
+                elif p.is_dir():
+                    for fp in p.iterdir():
+                        if fp.is_file():
+                            per_path.setdefault(fp.stem, []).append(fp)
+                for stem, files in per_path.items():
+                    index.setdefault(stem, files)
+            self._slide_index = index
+            self._slide_index_state = state
+        return self._slide_index
+
+    def invalidate_slide_index(self):
+        self._slide_index = None
+
+    def local_roots_resolved(self) -> List[str]:
+        """Realpaths of the local slide paths, resolved once per session.
+
+        Used for request authorization so the per-request check is a string
+        comparison instead of a Path.resolve() filesystem walk.
+        """
+        if self._local_roots is None:
+            self._local_roots = [
+                os.path.realpath(p) for p in self.slide_paths if not is_gcs_path(p)
+            ]
+        return self._local_roots
+
+    def _overlay_search_dirs(self) -> List[Path]:
+        """Directories searched for overlay files, in precedence order."""
+        dirs = []
         for overlay_path in self.overlay_paths:
-            if is_gcs_path(overlay_path):
+            if not is_gcs_path(overlay_path):
                 # GCS overlay not yet supported, skip for now
-                continue
-            else:
-                # Check local path
-                path = Path(overlay_path) / target
-                if path.exists():
-                    return str(path)
-        
-        # Also check in each slide directory
+                dirs.append(Path(overlay_path))
         for slide_path in self.slide_paths:
             if not is_gcs_path(slide_path):
-                # For local paths, check if it's a directory or file
                 p = Path(slide_path)
-                if p.is_dir():
-                    check_path = p / target
-                else:
-                    check_path = p.parent / target
-                
-                if check_path.exists():
-                    return str(check_path)
-        
-        return None
+                dirs.append(p if p.is_dir() else p.parent)
+        return dirs
+
+    def find_overlay_file(self, slide_name: str, suffix: str) -> Optional[str]:
+        """Find overlay file via a per-session filename index.
+
+        The index maps overlay filenames to their path (first directory
+        wins, same precedence as the old per-request scan) and is rebuilt
+        only when a searched directory's mtime changes — so the steady
+        state is a handful of stats plus a dict lookup, instead of an
+        exists() probe per directory per suffix.
+        """
+        dirs = self._overlay_search_dirs()
+        state: List[Optional[int]] = []
+        for d in dirs:
+            try:
+                state.append(d.stat().st_mtime_ns)
+            except OSError:
+                state.append(None)
+
+        if self._overlay_index is None or state != self._overlay_index_state:
+            index: Dict[str, str] = {}
+            for d, mtime in zip(dirs, state):
+                if mtime is None or not d.is_dir():
+                    continue
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            index.setdefault(entry.name, entry.path)
+            self._overlay_index = index
+            self._overlay_index_state = state
+
+        return self._overlay_index.get(f"{slide_name}{suffix}")
 
 
 class SessionManager:
@@ -78,7 +170,14 @@ class SessionManager:
     def __init__(self, ttl_minutes: int = 30):
         self.sessions: Dict[str, Session] = {}
         self.ttl_minutes = ttl_minutes
+        self.ttl_seconds = ttl_minutes * 60.0
         self._cleanup_task: Optional[asyncio.Task] = None
+        # Min-heap of (expiry_time, token); entries may be stale after a
+        # touch/delete and are re-validated against the session on pop.
+        self._expiry_heap: List[tuple] = []
+        # Projected listing for /api/sessions, rebuilt only when the
+        # session set changes (create/delete/heartbeat), not per poll.
+        self._sessions_view: Optional[List[dict]] = None
 
     def create_session(self, slide_paths: List[str], overlay_paths: List[str] = None) -> Session:
         token = str(uuid.uuid4())
@@ -87,33 +186,32 @@ class SessionManager:
         if overlay_paths is None:
             overlay_paths = []
 
-        # Normalize all slide paths
+        # Normalize all slide paths; os.path functions are C-level and
+        # skip Path object construction plus the extra stats Path.resolve
+        # performs per component
         normalized_slide_paths = []
         for path in slide_paths:
             path = path.strip()
             if is_gcs_path(path):
                 # Keep GCS paths as-is
                 normalized_slide_paths.append(path)
+            elif os.path.exists(path):
+                # Interned: shared slide dirs recur across many sessions,
+                # so identical realpaths collapse to one string object
+                normalized_slide_paths.append(sys.intern(os.path.realpath(path)))
             else:
-                # Resolve local paths
-                p = Path(path)
-                if p.exists():
-                    normalized_slide_paths.append(str(p.resolve()))
-                else:
-                    print(f"Warning: Slide path does not exist: {path}")
-        
+                print(f"Warning: Slide path does not exist: {path}")
+
         # Normalize overlay paths (local only for now)
         normalized_overlay_paths = []
         for path in overlay_paths:
             if is_gcs_path(path):
                 # GCS overlays not yet supported, but keep for future
                 normalized_overlay_paths.append(path)
+            elif os.path.isdir(path):
+                normalized_overlay_paths.append(sys.intern(os.path.realpath(path)))
             else:
-                p = Path(path)
-                if p.is_dir():
-                    normalized_overlay_paths.append(str(p.resolve()))
-                else:
-                    print(f"Warning: Overlay path does not exist or is not a directory: {path}")
+                print(f"Warning: Overlay path does not exist or is not a directory: {path}")
 
         session = Session(
             token=token,
@@ -121,6 +219,9 @@ class SessionManager:
             overlay_paths=normalized_overlay_paths,
         )
         self.sessions[token] = session
+        self._sessions_view = None
+        heapq.heappush(self._expiry_heap,
+                       (session.last_accessed_mono + self.ttl_seconds, token))
 
         print(f"✓ Session created: {token}")
         print(f"  Slide paths ({len(normalized_slide_paths)}): {normalized_slide_paths}")
@@ -136,20 +237,48 @@ class SessionManager:
     def delete_session(self, token: str) -> bool:
         if token in self.sessions:
             del self.sessions[token]
+            self._sessions_view = None
             print(f"✗ Session deleted: {token}")
             return True
         return False
 
+    def sessions_view(self) -> List[dict]:
+        """Cached projection of all sessions for the listing endpoint."""
+        if self._sessions_view is None:
+            self._sessions_view = [
+                {
+                    "token": s.token,
+                    "slide_paths": s.slide_paths,
+                    "overlay_paths": s.overlay_paths,
+                    "created_at": s.created_at.isoformat(),
+                    "last_accessed": s.last_accessed_utc().isoformat(),
+                }
+                for s in self.sessions.values()
+            ]
+        return self._sessions_view
+
+    def invalidate_sessions_view(self):
+        """Force the next sessions_view() to rebuild (e.g. after heartbeat)."""
+        self._sessions_view = None
+
     def cleanup_expired(self):
-        now = datetime.utcnow()
-        expired = [
-            t for t, s in self.sessions.items()
-            if (now - s.last_accessed).total_seconds() > self.ttl_minutes * 60
-        ]
-        for t in expired:
-            print(f"⏰ Session expired (idle {self.ttl_minutes}min): {t}")
-            self.delete_session(t)
-        return len(expired)
+        """Expire idle sessions; O(k log N) for the k entries due this sweep."""
+        now = time.monotonic()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, token = heapq.heappop(self._expiry_heap)
+            session = self.sessions.get(token)
+            if session is None:
+                continue  # already deleted; stale heap entry
+            current_expiry = session.last_accessed_mono + self.ttl_seconds
+            if current_expiry <= now:
+                print(f"⏰ Session expired (idle {self.ttl_minutes}min): {token}")
+                self.delete_session(token)
+                removed += 1
+            else:
+                # Session was touched since this entry was pushed; requeue
+                heapq.heappush(self._expiry_heap, (current_expiry, token))
+        return removed
 
     async def start_cleanup_loop(self, interval_minutes: int = 5):
         async def _loop():
@@ -0,0 +1,66 @@
+"""
+TTL Cache for WSI Viewer
+Small in-memory cache with per-entry time-to-live, used to memoize
+filesystem and GCS metadata lookups on hot request paths.
+"""
+
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Tuple
+
+
+class TTLCache:
+    """Dict-backed cache with lazy per-entry expiry.
+
+    Entries expire ttl_seconds after being stored. Expired entries are
+    dropped on access; when the cache grows past max_entries the oldest
+    entries are evicted.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl_seconds: float = 5.0, max_entries: int = 1024):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.max_entries and key not in self._data:
+                self._evict_oldest()
+            self._data[key] = (time.monotonic(), value)
+
+    def get_or_compute(self, key, fn: Callable[[], Any]):
+        """Return cached value for key, computing and storing it on a miss."""
+        value = self.get(key, self._MISSING)
+        if value is not self._MISSING:
+            return value
+        value = fn()
+        self.set(key, value)
+        return value
+
+    def invalidate(self, key) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict_oldest(self):
+        # Called with lock held; dict preserves insertion order.
+        oldest = next(iter(self._data), None)
+        if oldest is not None:
+            del self._data[oldest]